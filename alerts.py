@@ -0,0 +1,264 @@
+"""
+Alert dispatcher for newly emerging sharp plays.
+
+Diffs successive processed snapshots (the DataFrame built by
+fetch_and_process_data), emits an event whenever a market moves up into an
+alert tier of the Confidence Score Label / Decision Logic columns, and
+dispatches batches of deduplicated events to stdout, file and webhook sinks
+from a background thread.
+
+    python alerts.py --sports NBA,NFL --interval 15 --webhook http://localhost:8000/hook
+"""
+import argparse
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pandas as pd
+import requests
+
+from consensus import fetch_and_process_data
+from fixtures import FixturePages
+from labels import sports, tier_labels
+
+tier_rank = {label: rank for rank, label in enumerate(tier_labels)}
+
+default_alert_labels = ["🔥🔥 Extreme Sharp Play", "🔒 Verified Sharp Play"]
+
+# Columns that identify one side of one market within a sport. 'Side' is the Team
+# without the total line ("Over 220.5" -> "Over"), so a moved total is the same market
+market_key_columns = ['Sport', 'Matchup', 'Side', 'Betting Category']
+label_columns = ['Confidence Score Label', 'Decision Logic']
+
+
+def market_side(df):
+    """Returns the side of each pick: the team, or Over/Under for totals."""
+    team = df['Team'].astype(str)
+    return team.where(df['Betting Category'] != 'Total', team.str.split(' ', n=1).str[0])
+
+
+def diff_snapshots(previous, current, alert_labels=default_alert_labels):
+    """
+    Compares two processed snapshots and returns one event per market and label
+    column that moved into a stronger tier listed in alert_labels. Markets that
+    are new in the current snapshot count as crossing from no tier.
+    """
+    if current is None or current.empty:
+        return []
+    if previous is None or previous.empty:
+        previous = pd.DataFrame(columns=current.columns)
+    current = current.assign(Side=market_side(current))
+    previous = previous.assign(Side=market_side(previous))
+
+    merged = current.merge(
+        previous[market_key_columns + label_columns].drop_duplicates(subset=market_key_columns),
+        on=market_key_columns, how='left', suffixes=('', ' (previous)')
+    )
+
+    events = []
+    detected_at = datetime.now(timezone.utc).isoformat()
+    for column in label_columns:
+        # Unknown or missing previous labels rank below every tier
+        current_rank = merged[column].map(tier_rank)
+        previous_rank = merged[f"{column} (previous)"].map(tier_rank).fillna(len(tier_labels))
+        crossed = merged[merged[column].isin(alert_labels) & (current_rank < previous_rank)]
+
+        for row in crossed.to_dict('records'):
+            matchup_time = row.get('Matchup Time')
+            events.append({
+                'sport': row['Sport'],
+                'matchup': row['Matchup'],
+                'team': row['Team'],
+                'side': row['Side'],
+                'betting_category': row['Betting Category'],
+                'signal': column,
+                'label': row[column],
+                'previous_label': row[f"{column} (previous)"] if pd.notnull(row[f"{column} (previous)"]) else None,
+                'confidence_score': round(float(row['Confidence Score']), 2) if pd.notnull(row.get('Confidence Score')) else None,
+                'relative_differential': round(float(row['Relative Differential']), 2) if pd.notnull(row.get('Relative Differential')) else None,
+                'matchup_time': matchup_time.isoformat() if pd.notnull(matchup_time) else None,
+                'detected_at': detected_at,
+            })
+    return events
+
+
+def event_key(event):
+    return (event['sport'], event['matchup'], event['side'], event['betting_category'], event['signal'], event['label'])
+
+
+class StdoutSink:
+    def send(self, batch):
+        for event in batch:
+            print(f"[{event['detected_at']}] {event['sport']} {event['matchup']} {event['team']} "
+                  f"({event['betting_category']}): {event['label']} ({event['signal']})", flush=True)
+
+
+class FileSink:
+    """Appends events as JSON lines."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, batch):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for event in batch:
+                f.write(json.dumps(event, ensure_ascii=False, default=str) + '\n')
+
+
+class WebhookSink:
+    """POSTs each batch as {"alerts": [...]} to a webhook URL."""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, batch):
+        response = requests.post(self.url, data=json.dumps({'alerts': batch}, default=str),
+                                 headers={'Content-Type': 'application/json'}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class AlertDispatcher:
+    """
+    Queues events and delivers them to every sink from a background thread.
+    Events are grouped into batches of up to batch_size, flushed at least every
+    batch_interval seconds, and an event already sent within dedupe_ttl
+    seconds is dropped.
+    """
+
+    def __init__(self, sinks, batch_size=50, batch_interval=2.0, dedupe_ttl=6 * 60 * 60):
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.dedupe_ttl = dedupe_ttl
+        self._queue = queue.Queue()
+        self._sent_at = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='alert-dispatcher', daemon=True)
+        self._thread.start()
+
+    def publish(self, events):
+        for event in events:
+            self._queue.put(event)
+
+    def close(self, timeout=None):
+        """Flushes queued events and stops the worker thread."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _deduplicate(self, events):
+        now = time.monotonic()
+        self._sent_at = {key: sent for key, sent in self._sent_at.items() if now - sent < self.dedupe_ttl}
+        batch = []
+        for event in events:
+            key = event_key(event)
+            if key in self._sent_at:
+                continue
+            self._sent_at[key] = now
+            batch.append(event)
+        return batch
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty()):
+            pending = []
+            deadline = time.monotonic() + self.batch_interval
+            while len(pending) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(self._queue.get(timeout=min(remaining, 0.1)))
+                except queue.Empty:
+                    if self._stop.is_set():
+                        break
+
+            batch = self._deduplicate(pending)
+            if batch:
+                self._deliver(batch)
+
+    def _deliver(self, batch):
+        for sink in self.sinks:
+            try:
+                sink.send(batch)
+            except Exception as e:
+                # One failing sink must not block delivery to the others
+                print(f"Alert sink {type(sink).__name__} failed: {e!r}", file=sys.stderr)
+
+
+def watch(sports, dispatcher, interval=15, alert_labels=default_alert_labels, cycles=None, page_fetcher=None):
+    """
+    Fetches every sport concurrently every interval seconds, straight from
+    consensus.fetch_and_process_data with no UI involved, and publishes the
+    tier crossings between successive snapshots. An alert reaches the sinks
+    at most about interval + fetch time + the dispatcher's batch_interval
+    after the page changes.
+    """
+    snapshots = {}
+    cycle = 0
+    with ThreadPoolExecutor(max_workers=len(sports)) as executor:
+        while cycles is None or cycle < cycles:
+            started = time.monotonic()
+            fetches = {sport: executor.submit(fetch_and_process_data, sport, page_fetcher=page_fetcher) for sport in sports}
+            for sport, fetch in fetches.items():
+                try:
+                    current = fetch.result()
+                except Exception as e:
+                    print(f"Refreshing {sport} failed: {e!r}", file=sys.stderr)
+                    continue
+
+                # A failed fetch comes back as an empty frame; keep the last good baseline
+                # so markets already in an alert tier are not re-alerted on the next cycle
+                if current.empty:
+                    print(f"Refreshing {sport} returned no picks; keeping the previous snapshot", file=sys.stderr)
+                    continue
+
+                # The first snapshot only establishes a baseline
+                if sport in snapshots:
+                    dispatcher.publish(diff_snapshots(snapshots[sport], current, alert_labels))
+                snapshots[sport] = current
+
+            cycle += 1
+            if cycles is None or cycle < cycles:
+                time.sleep(max(0, interval - (time.monotonic() - started)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dispatch alerts when markets cross into sharp-play tiers.")
+    parser.add_argument('--sports', default=','.join(sports), help="Comma-separated sports to watch.")
+    parser.add_argument('--interval', type=float, default=15,
+                        help="Seconds between refreshes; alerts go out within about interval + fetch time + batch interval.")
+    parser.add_argument('--labels', default=','.join(default_alert_labels), help="Comma-separated tier labels that trigger an alert.")
+    parser.add_argument('--webhook', action='append', default=[], help="Webhook URL to POST alert batches to (repeatable).")
+    parser.add_argument('--file', help="Append alerts as JSON lines to this file.")
+    parser.add_argument('--quiet', action='store_true', help="Do not print alerts to stdout.")
+    parser.add_argument('--batch-size', type=int, default=50)
+    parser.add_argument('--batch-interval', type=float, default=2.0, help="Maximum seconds an alert waits before its batch is sent.")
+    parser.add_argument('--fixtures', help="Replay saved pages from this directory instead of fetching live (see fixtures.py).")
+    args = parser.parse_args()
+
+    # Fetch warnings and errors go to stderr; per-fetch progress is only logged at INFO
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s %(levelname)s %(message)s')
+    page_fetcher = FixturePages(args.fixtures).fetch_page if args.fixtures else None
+
+    sinks = [] if args.quiet else [StdoutSink()]
+    if args.file:
+        sinks.append(FileSink(args.file))
+    sinks.extend(WebhookSink(url) for url in args.webhook)
+
+    dispatcher = AlertDispatcher(sinks, batch_size=args.batch_size, batch_interval=args.batch_interval)
+    try:
+        watch([s.strip() for s in args.sports.split(',') if s.strip()], dispatcher,
+              interval=args.interval, page_fetcher=page_fetcher, alert_labels=[label.strip() for label in args.labels.split(',') if label.strip()])
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dispatcher.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Saved scoresandodds consensus pages for replaying the app's data offline.
+
+    python fixtures.py fixtures/      # save the live page for every sport
+"""
+import os
+import sys
+
+import requests
+
+from consensus import fetch_page
+from labels import sports
+
+
+def fixture_path(fixtures_dir, sport):
+    return os.path.join(fixtures_dir, f"{sport.lower()}.html")
+
+
+def record_fixtures(fixtures_dir):
+    """Fetches the live consensus pages once and saves them for replay."""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    for sport in sports:
+        url = f"https://www.scoresandodds.com/{sport.lower()}/consensus-picks"
+        with open(fixture_path(fixtures_dir, sport), 'w', encoding='utf-8') as f:
+            f.write(fetch_page(url))
+        print(f"Saved {url} -> {fixture_path(fixtures_dir, sport)}")
+
+
+class FixturePages:
+    """
+    Serves saved pages in place of consensus.fetch_page. Pass its fetch_page
+    as page_fetcher to fetch_and_process_data.
+    """
+
+    def __init__(self, fixtures_dir):
+        self.pages = {}
+        for sport in sports:
+            path = fixture_path(fixtures_dir, sport)
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    self.pages[sport.lower()] = f.read()
+        if not self.pages:
+            raise FileNotFoundError(f"No fixture pages found in {fixtures_dir}; record them with fixtures.py first.")
+
+    def fetch_page(self, url):
+        # URLs look like https://www.scoresandodds.com/<sport>/consensus-picks
+        sport = url.rstrip('/').split('/')[-2].lower()
+        if sport not in self.pages:
+            # Raised like a failed live request, so fetch_and_process_data reports it the same way
+            raise requests.exceptions.HTTPError(f"404 No fixture page for url: {url}")
+        return self.pages[sport]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        sys.exit("usage: python fixtures.py <fixtures_dir>")
+    record_fixtures(sys.argv[1])
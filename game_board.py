@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+betting_categories = ['Moneyline', 'Spread', 'Total']
+board_fields = ['Team', 'Line', 'Confidence Score', 'Confidence Score Label']
+
+
+def build_game_board(df_picks):
+    """
+    Rolls the per-side picks of one snapshot up into one row per game, keyed by
+    (Matchup, Matchup Time). For each of Moneyline, Spread and Total the row
+    holds the sharper side (highest Confidence Score), its line, score and label.
+
+    'Moneyline/Spread Agree' marks games where both markets favour the same team.
+    Total is left out of that check because Over/Under cannot match a team;
+    it only counts towards 'Sharp Markets', the number of markets whose sharper
+    side has a positive Confidence Score.
+    """
+    if df_picks is None or df_picks.empty:
+        return pd.DataFrame()
+
+    # Games without a parsed start time cannot be keyed (and are never inside the time window)
+    picks = df_picks[df_picks['Betting Category'].isin(betting_categories) & df_picks['Matchup Time'].notna()]
+    if picks.empty:
+        return pd.DataFrame()
+    category = picks['Betting Category']
+    # Moneyline shows both prices, Spread its spread pair, Total the number after "Over"/"Under"
+    line = np.select(
+        [category == 'Moneyline', category == 'Spread', category == 'Total'],
+        [
+            picks['Away Odds'].fillna('N/A').astype(str) + ' / ' + picks['Home Odds'].fillna('N/A').astype(str),
+            picks['Spread Line'].fillna('N/A').astype(str),
+            picks['Team'].astype(str).str.split(' ', n=1).str[-1],
+        ],
+        default='N/A'
+    )
+    picks = picks.assign(Line=line)
+
+    best_sides = picks.sort_values('Confidence Score', ascending=False, na_position='last') \
+        .drop_duplicates(subset=['Matchup', 'Matchup Time', 'Betting Category'])
+    board = best_sides.set_index(['Matchup', 'Matchup Time', 'Betting Category'])[board_fields] \
+        .unstack('Betting Category') \
+        .reindex(columns=pd.MultiIndex.from_product([board_fields, betting_categories]))
+    board.columns = [f"{category} {field}" for field, category in board.columns]
+    board = board[[f"{category} {field}" for category in betting_categories for field in board_fields]]
+
+    # Whether the sharp side agrees across markets, precomputed once per game
+    board['Moneyline/Spread Agree'] = board['Moneyline Team'].notna() & \
+                                      (board['Moneyline Team'] == board['Spread Team'])
+    board['Sharp Markets'] = (board[[f"{category} Confidence Score" for category in betting_categories]] > 0).sum(axis=1)
+
+    sports = picks.drop_duplicates(subset=['Matchup', 'Matchup Time']).set_index(['Matchup', 'Matchup Time'])['Sport']
+    board.insert(0, 'Sport', sports.reindex(board.index).to_numpy())
+
+    return board.sort_index(level='Matchup Time', sort_remaining=False)
@@ -0,0 +1,68 @@
+import pandas as pd
+
+# Sports offered in the sidebar and watched by the alert and load-test tools
+sports = ["NBA", "NFL", "NHL", "MLB", "NCAAF", "NCAAB"]
+
+# Labels returned by get_decision_label / get_confidence_score_label, strongest sharp signal first
+tier_labels = [
+    "🔥🔥 Extreme Sharp Play",
+    "🔒 Verified Sharp Play",
+    "💎 Strong Sharp",
+    "📈 Medium Sharp",
+    "📊 Slight Sharp",
+    "⚖️ Neutral",
+    "⬇️ Slight Public",
+    "⚠️ Public-lean bias",
+    "🚨 Strong Public",
+]
+
+
+# Function to determine decision logic label based on Actual Diff %
+def get_decision_label(relative_differential):
+    if pd.isna(relative_differential):
+        return "N/A"
+    elif relative_differential > 20:
+        return "🔥🔥 Extreme Sharp Play"
+    elif relative_differential >= 15:
+        return "🔒 Verified Sharp Play"
+    elif relative_differential >= 10:
+        return "💎 Strong Sharp"
+    elif relative_differential >= 5:
+        return "📈 Medium Sharp"
+    elif relative_differential > 0:
+        return "📊 Slight Sharp"
+    elif relative_differential == 0:
+        return "⚖️ Neutral"
+    elif relative_differential >= -5:
+        return "⬇️ Slight Public"
+    elif relative_differential >= -10:
+        return "⚠️ Public-lean bias"
+    elif relative_differential < -10:
+        return "🚨 Strong Public"
+    else:
+        return "Other (Unhandled Score)"
+
+
+def get_confidence_score_label(confidence_score):
+    if pd.isna(confidence_score):
+            return "N/A"
+    elif confidence_score > 20:
+        return "🔥🔥 Extreme Sharp Play"
+    elif confidence_score >= 15:
+        return "🔒 Verified Sharp Play"
+    elif confidence_score >= 10:
+        return "💎 Strong Sharp"
+    elif confidence_score >= 5:
+        return "📈 Medium Sharp"
+    elif confidence_score > 0: # and confidence_score < 5:
+        return "📊 Slight Sharp"
+    elif confidence_score == 0:
+        return "⚖️ Neutral"
+    elif confidence_score >= -5: # and confidence_score < 0:
+        return "⬇️ Slight Public"
+    elif confidence_score >= -10: # and confidence_score < -5:
+        return "⚠️ Public-lean bias"
+    elif confidence_score < -10:
+        return "🚨 Strong Public"
+    else:
+        return "Other (Unhandled Score)"
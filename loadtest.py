@@ -0,0 +1,235 @@
+"""
+Load test for the Streamlit app.
+
+Drives N concurrent headless sessions of streamlit_app.py against locally
+replayed scoresandodds pages and reports rerun latency percentiles, CPU time
+and RSS for each session count.
+
+Each session runs Streamlit's AppTest harness in its own process. AppTest
+swaps process-global runtime state on every run and cannot drive several
+sessions from threads of one process. Within a process the compiled script
+is cached across reruns, as a server does. Every session count starts from
+fresh processes, so memory from one level never leaks into the next.
+
+    python fixtures.py fixtures/                  # save live pages to fixtures/
+    python loadtest.py --sessions 1,5,10,25       # replay them under load
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import random
+import resource
+import sys
+import time
+
+import numpy as np
+
+from labels import sports
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, 'streamlit_app.py')
+DEFAULT_FIXTURES_DIR = os.path.join(APP_DIR, 'fixtures')
+
+
+def current_rss_mb():
+    """Current resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return max_rss / 1024 / 1024 if sys.platform == 'darwin' else max_rss / 1024
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def rerun_failure(app):
+    """Returns why a rerun failed, or None if it rendered the page."""
+    if app.exception:
+        return app.exception[0].message
+    # Compile errors and aborted reruns are logged but leave nothing rendered
+    if not app.title:
+        return "rerun rendered nothing"
+    return None
+
+
+def prepare_session_process(fixtures_dir):
+    """Points the app at the fixture pages and shares one script cache across this process's reruns."""
+    import consensus
+    from fixtures import FixturePages
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    import streamlit.testing.v1.app_test as app_test
+
+    # The app calls fetch_and_process_data without a page_fetcher, so replay through the module default
+    consensus.fetch_page = FixturePages(fixtures_dir).fetch_page
+
+    # AppTest builds a new ScriptCache on every run, recompiling the script each time;
+    # a server compiles it once, so reuse a single cache within this process
+    script_cache = ScriptCache()
+    app_test.ScriptCache = lambda: script_cache
+
+
+def run_session(session_id, actions, timeout, fixtures_dir, start_barrier, results):
+    """Runs one headless dashboard session in this process and reports its measurements."""
+    result = {'latencies': [], 'errors': [], 'cpu': 0.0, 'wall': 0.0, 'rss_base': 0.0, 'rss_end': 0.0, 'rss_peak': 0.0}
+    try:
+        from streamlit.testing.v1 import AppTest
+
+        prepare_session_process(fixtures_dir)
+        # Untimed warm-up: loads the app's imports and fills this process's script cache
+        failure = rerun_failure(AppTest.from_file(APP_PATH, default_timeout=timeout).run())
+        if failure:
+            raise RuntimeError(f"warm-up run failed: {failure}")
+        result['rss_base'] = current_rss_mb()
+        at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    except Exception as e:
+        result['errors'].append(f"session {session_id}: {e!r}")
+        start_barrier.abort()
+        results.put(result)
+        return
+
+    rng = random.Random(session_id)
+
+    def timed(step):
+        """Times one rerun; returns False if it failed, leaving the session without widgets to drive."""
+        started = time.perf_counter()
+        app = step()
+        elapsed = time.perf_counter() - started
+        failure = rerun_failure(app)
+        # Failed reruns are reported as errors and kept out of the latency figures
+        if failure:
+            result['errors'].append(f"session {session_id}: {failure}")
+            return False
+        result['latencies'].append(elapsed)
+        return True
+
+    try:
+        start_barrier.wait()
+    except Exception as e:
+        result['errors'].append(f"session {session_id}: another session failed to start ({e!r})")
+        results.put(result)
+        return
+
+    cpu_before = cpu_seconds()
+    wall_before = time.perf_counter()
+    # A session stops at its first failed rerun, so one failure counts as one error
+    try:
+        succeeded = timed(at.run)
+        for _ in range(actions):
+            if not succeeded:
+                break
+            action = rng.choice(['sport', 'time_window', 'refresh'])
+            if action == 'sport':
+                succeeded = timed(at.sidebar.selectbox[0].select(rng.choice(sports)).run)
+            elif action == 'time_window':
+                succeeded = timed(at.sidebar.number_input[0].set_value(rng.randint(1, 168)).run)
+            else:
+                succeeded = timed(at.sidebar.button[0].click().run)
+    except Exception as e:
+        result['errors'].append(f"session {session_id}: {e!r}")
+
+    result['wall'] = time.perf_counter() - wall_before
+    result['cpu'] = cpu_seconds() - cpu_before
+    result['rss_end'] = current_rss_mb()
+    result['rss_peak'] = peak_rss_mb()
+    results.put(result)
+
+
+def run_level(session_count, actions, timeout, fixtures_dir):
+    """Runs session_count sessions, each in a fresh process, released together by a barrier."""
+    context = multiprocessing.get_context('spawn')
+    start_barrier = context.Barrier(session_count)
+    results = context.Queue()
+    processes = [
+        context.Process(target=run_session, args=(i, actions, timeout, fixtures_dir, start_barrier, results))
+        for i in range(session_count)
+    ]
+    for process in processes:
+        process.start()
+
+    session_results = []
+    errors = []
+    # Every rerun is bounded by timeout, plus the warm-up and process start-up
+    deadline = time.monotonic() + (actions + 2) * timeout + 60
+    while len(session_results) < session_count:
+        try:
+            session_results.append(results.get(timeout=max(0.1, deadline - time.monotonic())))
+        except queue.Empty:
+            errors.append(f"{session_count - len(session_results)} sessions did not report before the deadline")
+            break
+    for process in processes:
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+
+    latencies_ms = np.array([latency for r in session_results for latency in r['latencies']]) * 1000
+    errors.extend(error for r in session_results for error in r['errors'])
+    measured = [r for r in session_results if r['rss_end']]
+
+    def mean(values):
+        return float(np.mean(values)) if values else float('nan')
+
+    return {
+        'sessions': session_count,
+        'reruns': len(latencies_ms),
+        'errors': errors,
+        'p50': np.percentile(latencies_ms, 50) if len(latencies_ms) else float('nan'),
+        'p90': np.percentile(latencies_ms, 90) if len(latencies_ms) else float('nan'),
+        'p99': np.percentile(latencies_ms, 99) if len(latencies_ms) else float('nan'),
+        'max': latencies_ms.max() if len(latencies_ms) else float('nan'),
+        'wall': max((r['wall'] for r in session_results), default=float('nan')),
+        'cpu': sum(r['cpu'] for r in session_results),
+        # Memory a session adds on top of its warmed-up process, and the processes' mean peak
+        'rss_session': mean([r['rss_end'] - r['rss_base'] for r in measured]),
+        'rss_peak': mean([r['rss_peak'] for r in measured]),
+    }
+
+
+def print_report(results):
+    print()
+    print(f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'wall s':>7} {'cpu s':>7} {'cpu/sess':>8} {'rss/sess':>8} {'peak MB':>8} {'errors':>6}")
+    for r in results:
+        print(f"{r['sessions']:>8} {r['reruns']:>7} {r['p50']:>8.1f} {r['p90']:>8.1f} {r['p99']:>8.1f} {r['max']:>8.1f} "
+              f"{r['wall']:>7.1f} {r['cpu']:>7.2f} {r['cpu'] / r['sessions']:>8.3f} {r['rss_session']:>8.2f} "
+              f"{r['rss_peak']:>8.1f} {len(r['errors']):>6}")
+    print("rss/sess: MB a session adds to its warmed-up process; peak MB: mean peak RSS of a session process")
+    for r in results:
+        for error in r['errors'][:5]:
+            print(f"[{r['sessions']} sessions] {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the sports betting dashboard with concurrent headless sessions.")
+    parser.add_argument('--sessions', default='1,5,10,25', help="Comma-separated concurrent session counts to test.")
+    parser.add_argument('--actions', type=int, default=10, help="Sport switches, time-window changes and refreshes per session.")
+    parser.add_argument('--timeout', type=float, default=60, help="Seconds to wait for a single rerun before failing it.")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR, help="Directory of saved <sport>.html pages to replay (see fixtures.py).")
+    args = parser.parse_args()
+
+    # Fail before spawning anything if there is nothing to replay
+    from fixtures import FixturePages
+    try:
+        FixturePages(args.fixtures)
+    except FileNotFoundError as e:
+        sys.exit(str(e))
+
+    session_counts = [int(n) for n in args.sessions.split(',') if n.strip()]
+    results = []
+    for session_count in session_counts:
+        print(f"Running {session_count} concurrent sessions x {args.actions} actions...")
+        results.append(run_level(session_count, args.actions, args.timeout, args.fixtures))
+    print_report(results)
+
+
+if __name__ == '__main__':
+    main()
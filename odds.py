@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+
+# Function to parse American odds strings ("+150", "-110", "EVEN") into a float array
+def parse_american_odds(odds_series):
+    """
+    Parses a Series of American odds strings into a numeric array. Only the
+    price, the last whitespace-separated token, is kept (e.g. "+3.5 -110" -> -110,
+    "o220.5 -105" -> -105, "-3.5 even" -> +100); strings without a price
+    token ("o220") become NaN.
+    """
+    odds_text = odds_series.astype('string').str.strip().str.lower()
+    odds_text = odds_text.str.replace(r'(?<!\S)(?:even|ev|pk)(?!\S)', '+100', regex=True)
+    # The price must be its own whitespace-separated token at the end, so a bare line like "o220" is not a price
+    odds = pd.to_numeric(odds_text.str.extract(r'(?:^|\s)([\+\-]?\d{3,})$', expand=False), errors='coerce')
+    odds = odds.to_numpy(dtype=float, na_value=np.nan)
+    return odds
+
+
+# Function to convert American odds to implied probability (0-1)
+def implied_probability(odds):
+    """Converts American odds to the bookmaker's implied probability, vig included."""
+    odds = np.asarray(odds, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(odds < 0, -odds / (-odds + 100), 100 / (odds + 100))
+
+
+# Function to convert American odds to decimal odds (total return per unit staked)
+def decimal_odds(odds):
+    odds = np.asarray(odds, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(odds < 0, 1 + 100 / -odds, 1 + odds / 100)
+
+
+def add_odds_columns(df, is_away_side):
+    """
+    Adds implied probability, no-vig fair probability and expected value columns
+    to the picks DataFrame. `is_away_side` is a boolean mask marking rows that
+    are the first listed side of their market (away team or Over).
+    """
+    if df.empty:
+        return df
+
+    away_odds = parse_american_odds(df['Away Odds'])
+    home_odds = parse_american_odds(df['Home Odds'])
+    is_away_side = np.asarray(is_away_side, dtype=bool)
+
+    away_implied = implied_probability(away_odds)
+    home_implied = implied_probability(home_odds)
+    side_odds = np.where(is_away_side, away_odds, home_odds)
+    side_implied = np.where(is_away_side, away_implied, home_implied)
+
+    # Remove the bookmaker margin by normalising both sides of the market to 100%
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fair_probability = side_implied / (away_implied + home_implied)
+
+    # EV per unit staked if the money split is taken as the true probability of the side
+    money_probability = pd.to_numeric(df['Money %'], errors='coerce').to_numpy(dtype=float, na_value=np.nan) / 100
+    expected_value = money_probability * decimal_odds(side_odds) - 1
+
+    df['Implied Prob %'] = np.round(side_implied * 100, 2)
+    df['Fair Prob %'] = np.round(fair_probability * 100, 2)
+    df['EV %'] = np.round(expected_value * 100, 2)
+    return df
@@ -0,0 +1,83 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+# Width of the start-time buckets, in seconds
+bucket_seconds = 60 * 60
+
+
+class TopPlaysIndex:
+    """
+    Keeps each loaded sport's picks bucketed by start hour, with every bucket
+    pre-sorted by Confidence Score, so the strongest plays in a time window can
+    be read off by merging only the buckets inside that window.
+    """
+
+    def __init__(self):
+        # sport -> (sorted bucket keys, {bucket key: entries sorted by score}, entries without a start time)
+        self._by_sport = {}
+
+    def update(self, sport, df_picks):
+        """Replaces the ranked entries for one sport with a fresh snapshot."""
+        if df_picks is None or df_picks.empty or 'Confidence Score' not in df_picks.columns:
+            self._by_sport.pop(sport, None)
+            return
+
+        scored = df_picks[df_picks['Confidence Score'].notna()]
+        records = scored.to_dict('records')
+        scores = scored['Confidence Score'].to_numpy(dtype=float)
+        order = np.argsort(-scores, kind='stable')
+
+        buckets = defaultdict(list)
+        untimed = []
+        for i in order:
+            record = records[i]
+            matchup_time = record.get('Matchup Time')
+            start_seconds = matchup_time.timestamp() if pd.notnull(matchup_time) else None
+            # (negated score, sport, position) is unique, so heapq never compares start times or records
+            entry = (-scores[i], sport, int(i), start_seconds, record)
+            if start_seconds is None:
+                untimed.append(entry)
+            else:
+                buckets[int(start_seconds // bucket_seconds)].append(entry)
+        self._by_sport[sport] = (sorted(buckets), dict(buckets), untimed)
+
+    def loaded_sports(self):
+        return list(self._by_sport)
+
+    def top(self, k, start_time=None, end_time=None):
+        """
+        Returns up to k pick records (dicts), highest Confidence Score first,
+        across all loaded sports, limited to games starting between start_time
+        and end_time. Building a display frame is left to the caller.
+        """
+        top_plays = []
+        if k <= 0:
+            return top_plays
+
+        windowed = start_time is not None or end_time is not None
+        start_seconds = start_time.timestamp() if start_time is not None else float('-inf')
+        end_seconds = end_time.timestamp() if end_time is not None else float('inf')
+
+        candidate_lists = []
+        for bucket_keys, buckets, untimed in self._by_sport.values():
+            if windowed:
+                first = bisect_left(bucket_keys, start_seconds // bucket_seconds)
+                last = bisect_right(bucket_keys, end_seconds // bucket_seconds)
+                candidate_lists.extend(buckets[key] for key in bucket_keys[first:last])
+            else:
+                candidate_lists.extend(buckets.values())
+                candidate_lists.append(untimed)
+
+        # Every bucket is already sorted, so a lazy k-way merge stops as soon as k plays qualify.
+        # Only the two edge buckets of the window can hold entries outside it.
+        for _, _, _, matchup_seconds, record in heapq.merge(*candidate_lists):
+            if windowed and not start_seconds <= matchup_seconds <= end_seconds:
+                continue
+            top_plays.append(record)
+            if len(top_plays) >= k:
+                break
+
+        return top_plays